@@ -1,25 +1,43 @@
 import logging
 import asyncio
+from typing import Optional
 
 
 from services.agent_service import AgentService
 from services.mcp_service import MCPService
-from services.llm_service import llm
+from services.llm_service import llm, warmup
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Graph compilation, prompt templates and ReAct agent wiring only need to
+# happen once, so the AgentService is a lazily-built singleton.
+_service: Optional[AgentService] = None
+_service_lock = asyncio.Lock()
 
-async def process(input: str):
 
-    mcp = MCPService()
-    all_tools = await mcp.get_all_tools()
+async def _get_service() -> AgentService:
+    global _service
+    if _service is None:
+        async with _service_lock:
+            if _service is None:
+                # Preload the model while the tools are being fetched so the
+                # first supervisor call doesn't pay the Ollama cold start
+                warmup_task = asyncio.create_task(warmup())
+                mcp = MCPService()
+                all_tools = await mcp.get_all_tools()
+                _service = AgentService(all_tools, llm)
+                await warmup_task
+    return _service
+
+
+async def process(input: str):
 
-    service = AgentService(all_tools, llm)
+    service = await _get_service()
     result = await service.agent_invoke(input)
     return result
 
 if __name__ == "__main__":
     input = "what is the combined headcount of Microsoft and Accenture?"
-    asyncio.run(process(input))
\ No newline at end of file
+    asyncio.run(process(input))
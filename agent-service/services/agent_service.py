@@ -1,49 +1,150 @@
 import logging
+import ast
 import asyncio
-import json
+import operator
+import sys
+
+import orjson
 from typing import Annotated, Optional
 from typing_extensions import TypedDict
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
+from langgraph.constants import Send
 from langgraph.prebuilt import create_react_agent
 from langchain_core.messages import HumanMessage, BaseMessage, SystemMessage, AIMessage
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda
 #from langchain_core.pydantic_v1 import BaseModel, Field
 from pydantic import BaseModel, Field
-from langchain.tools import StructuredTool
 from typing import Callable
+from contextvars import ContextVar
+
+from services.cache import CacheManager
 
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Logging is configured once by the entrypoint (main.py); configuring it
+# here too would install a duplicate root handler and double every write
 logger = logging.getLogger(__name__)
 
+# Tool-name filters for wiring the worker agents; frozensets give O(1)
+# membership checks without re-allocating a list per lookup
+MATH_TOOL_NAMES = frozenset({"evaluate", "add", "subtract", "multiply", "divide", "average"})
+RESEARCH_TOOL_NAMES = frozenset({"wiki_crawler", "wiki_crawler_batch"})
+
+# Graph nodes a Send may target; anything else from the LLM is discarded
+WORKER_NODES = frozenset({"web_search", "math"})
+
+# Worker system prompts live at module scope and are passed to
+# create_react_agent as a fixed prefix: keeping them byte-identical and first
+# in every request lets Ollama/llama.cpp reuse the KV-cache for the prefix
+# instead of re-encoding it on each hop.
+WEB_SEARCH_SYSTEM_PROMPT = """You are a web research specialist. Use your tools to search for company information including revenue, headcount, headquarters, market cap, and other relevant business data. Always use your tools when asked to find information.
+When asked about MORE THAN ONE company, prefer a single wiki_crawler_batch call with all the company names; use wiki_crawler only for a single company."""
+
+MATH_SYSTEM_PROMPT = """You are a mathematical calculation specialist. You have access to mathematical tools: evaluate, add, subtract, multiply, divide, and average.
+
+IMPORTANT: You MUST use your available tools for ANY mathematical calculations, even simple ones. Never perform calculations manually in your response.
+- PREFER the 'evaluate' tool: pass the whole arithmetic expression in ONE call, e.g. evaluate("(221000 + 738000) / 2") or evaluate("average(1, 2, 3)").
+- Only fall back to the single-step tools (add, subtract, multiply, divide, average) if 'evaluate' is unavailable.
+
+When you receive a request involving numbers or calculations, build the full expression and evaluate it in a single tool call."""
+
+# Operators accepted when short-circuiting trivial arithmetic locally
+_ARITH_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+
+def _try_eval_arithmetic(text: str):
+    """Returns the value of text if it is a pure arithmetic expression, else None."""
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+    except (SyntaxError, ValueError):
+        return None
+
+    def _eval(node):
+        if isinstance(node, ast.Expression):
+            return _eval(node.body)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return node.value
+        if isinstance(node, ast.BinOp) and type(node.op) in _ARITH_OPS:
+            return _ARITH_OPS[type(node.op)](_eval(node.left), _eval(node.right))
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _ARITH_OPS:
+            return _ARITH_OPS[type(node.op)](_eval(node.operand))
+        raise ValueError("not a pure arithmetic expression")
+
+    try:
+        return _eval(tree)
+    except (ValueError, ZeroDivisionError, OverflowError):
+        return None
+
+
+# Per-branch auth state for the wrapped tool coroutines, which have no
+# access to graph state. LangGraph runs every node in its own asyncio task
+# with a copied context, so a value set in one node is invisible to the
+# next; the credentials therefore travel in graph state (State.access_token
+# / State.session_id) and each worker node seeds these vars from state on
+# entry. Tool calls nested under that node then see them, and concurrent
+# agent_invoke calls on a shared AgentService stay isolated.
+_ACCESS_TOKEN: ContextVar[Optional[str]] = ContextVar("access_token", default=None)
+_SESSION_ID: ContextVar[Optional[str]] = ContextVar("session_id", default=None)
+
 # --- State Definition ---
 class State(TypedDict):
     messages: Annotated[list, add_messages]
+    # One-line summaries of worker results; this is all the supervisor sees,
+    # so its prompt grows O(N) in hops instead of O(N^2) message tokens
+    scratchpad: Annotated[list, operator.add]
     query: str
     company_name: Optional[str]
     access_token: Optional[str]
+    session_id: Optional[str]
     # The 'next' key will be populated by the supervisor
-    next: str
+    next: list[str]
+    # Independent sub-tasks the supervisor wants executed in parallel
+    tasks: list
+
+class RouterTask(BaseModel):
+    """
+    A single, self-contained unit of work for one worker agent.
+    """
+    agent: str = Field(
+        description="The worker to run this task: 'web_search' or 'math'.",
+    )
+    query: str = Field(
+        description="A self-contained instruction for the worker, e.g. 'Find the headcount of Microsoft'.",
+    )
 
 class Router(BaseModel):
     """
-    Defines the next team to deploy or the final action to take.
+    Defines the next team(s) to deploy or the final action to take.
     """
-    next: str = Field(
-        description="Must be one of: 'web_search', 'math' or 'report_generator'.",
+    next: list[str] = Field(
+        description="The workers to deploy next. Each entry must be 'web_search' or 'math'. Use ['report_generator'] when enough info has been gathered.",
+    )
+    tasks: list[RouterTask] = Field(
+        default_factory=list,
+        description="One entry per independent sub-task. Leave empty when routing to 'report_generator'.",
     )
 
 
 
 class AgentService:
-    def __init__(self, all_tools, llm):        
+    def __init__(self, all_tools, llm, on_report_token: Optional[Callable[[str], None]] = None):
         self.llm = llm
         self.all_tools = all_tools
-        self._access_token = None
+        # Called with each report token as it is generated; defaults to stdout
+        # so the user starts reading the report while it is still being written
+        self._on_report_token = on_report_token or (lambda token: (sys.stdout.write(token), sys.stdout.flush()))
         def get_token():
-            return self._access_token
+            return _ACCESS_TOKEN.get()
         
         # Supervisor Chain: This is much cleaner and more direct.
         supervisor_prompt = ChatPromptTemplate.from_messages([
@@ -52,13 +153,29 @@ class AgentService:
             - web_search: Handles all public web searches get revenue, head count, headquarters, market cap etc (Wikipedia).
             - math: Handles mathematical operations only.
 
-            Based on the user's query and the conversation history, decide which team to deploy next.
-            Your response MUST be one of the following exact strings: "web_search", "math", or "report_generator".
-            If enough info has been gathered to answer the query, respond with "report_generator".
+            Based on the user's query and the conversation history, decide which team(s) to deploy next.
+            Each entry in 'next' MUST be one of the following exact strings: "web_search", "math", or "report_generator".
+            If the query contains INDEPENDENT sub-goals (e.g. look up several companies), emit one task per
+            sub-goal so they can run in parallel: fill 'tasks' with {agent, query} entries and list each
+            agent in 'next'. Do not split dependent steps (e.g. math over numbers not yet gathered).
+            If enough info has been gathered to answer the query, respond with next=["report_generator"] and no tasks.
+
+            Respond ONLY with a JSON object of this exact shape:
+            {{"next": ["web_search"], "tasks": [{{"agent": "web_search", "query": "..."}}]}}
             """),
-            ("placeholder", "{messages}")
+            ("human", "Query: {query}\n\nProgress so far:\n{scratchpad}")
         ])
-        self.supervisor_chain = supervisor_prompt | self.llm.with_structured_output(Router)
+        # JSON mode constrains decoding in a single pass; with_structured_output
+        # on ChatOllama costs an extra tool-call simulation (and retries) per hop
+        self.supervisor_chain = (
+            supervisor_prompt
+            | self.llm.bind(format="json")
+            | RunnableLambda(self._parse_router)
+        )
+
+        # Routing decisions for the same query/progress are highly repetitive,
+        # so cache them (exact hash first, then semantic similarity).
+        self.router_cache = CacheManager()
 
         # Report Generator Chain
         report_generator_prompt = ChatPromptTemplate.from_messages([
@@ -72,54 +189,56 @@ class AgentService:
         self.report_generator_chain = report_generator_prompt | self.llm
 
         # --- 2. Create ReAct Agents for Tool-Using Workers ---
+        # One name->tool map instead of a linear scan per lookup
+        self.tool_map = {tool.name: tool for tool in all_tools}
+
+        # The MCP server enforces require_auth on research and math tools
+        # alike, so both sets go through the credential-injection wrapper
         research_tools = [
-            self.wrap_authenticated_tool(tool, get_token)
-            for tool in self.all_tools if tool.name in ["wiki_crawler"]
+            self.wrap_authenticated_tool(self.tool_map[name], get_token)
+            for name in RESEARCH_TOOL_NAMES if name in self.tool_map
         ]
 
         math_tools = [
-            self.wrap_authenticated_tool(tool, get_token)
-            for tool in self.all_tools if tool.name in ["add", "subtract", "multiply", "divide", "average"]
+            self.wrap_authenticated_tool(self.tool_map[name], get_token)
+            for name in MATH_TOOL_NAMES if name in self.tool_map
         ]
 
-        # These are your specialist agents that need to reason about tools
-        self.web_search_agent = create_react_agent(self.llm, tools=research_tools)
-        self.math_agent = create_react_agent(self.llm, tools=math_tools)
+        # These are your specialist agents that need to reason about tools.
+        # The system prompts are fixed here so every call shares the same prefix.
+        self.web_search_agent = create_react_agent(
+            self.llm, tools=research_tools, prompt=SystemMessage(content=WEB_SEARCH_SYSTEM_PROMPT)
+        )
+        self.math_agent = create_react_agent(
+            self.llm, tools=math_tools, prompt=SystemMessage(content=MATH_SYSTEM_PROMPT)
+        )
 
         # --- 3. Build the Graph ---
         self.graph = self._create_graph()
 
     def wrap_authenticated_tool(self, mcp_tool, get_token):
-        # Check if this is a math tool that doesn't need authentication
-        math_tool_names = ["add", "subtract", "multiply", "divide", "average"]
-        
-        if mcp_tool.name in math_tool_names:
-            # For math tools, create a simple wrapper without authentication
-            async def _invoke_math(**tool_input):
-                return await mcp_tool.ainvoke(tool_input)
-            
-            return StructuredTool.from_function(
-                coroutine=_invoke_math,
-                name=mcp_tool.name,
-                description=mcp_tool.description or f"Math tool {mcp_tool.name}",
-                args_schema=mcp_tool.args_schema
-            )
-        else:
-            # For other tools that need authentication
-            async def _invoke(**tool_input):
-                token = get_token()
-                if not token:
-                    raise ValueError("No access token available for tool call")
-                
-                tool_input["headers"] = {"Authorization": f"Bearer {token}"}
-                return await mcp_tool.ainvoke(tool_input)
-
-            return StructuredTool.from_function(
-                coroutine=_invoke,
-                name=mcp_tool.name,
-                description=mcp_tool.description or f"MCP tool {mcp_tool.name}",
-                args_schema=mcp_tool.args_schema
-            )     
+        # Patch the existing tool's coroutine instead of re-wrapping it in
+        # a new StructuredTool: the ReAct agent then validates the arguments
+        # once through the original args_schema rather than twice (wrapper
+        # schema + inner ainvoke).
+        original = mcp_tool.coroutine
+
+        async def _invoke(**tool_input):
+            # Prefer the session id: server-side it's a plain dict lookup
+            session_id = _SESSION_ID.get()
+            if session_id:
+                tool_input["session_id"] = session_id
+                return await original(**tool_input)
+
+            token = get_token()
+            if not token:
+                raise ValueError("No access token available for tool call")
+
+            tool_input["headers"] = {"Authorization": f"Bearer {token}"}
+            return await original(**tool_input)
+
+        mcp_tool.coroutine = _invoke
+        return mcp_tool
 
     def _create_graph(self) -> StateGraph:
         """Builds the supervisor-based workflow."""
@@ -135,12 +254,8 @@ class AgentService:
         # Build the graph
         workflow.set_entry_point("human_login")
         workflow.add_conditional_edges("supervisor",
-            lambda state: state["next"],
-            {
-                "web_search": "web_search",
-                "math": "math",
-                "report_generator": "report_generator",
-            }
+            self._dispatch_workers,
+            ["web_search", "math", "report_generator"]
         )
         
         # After the workers are done, they go back to the supervisor for the next decision
@@ -151,17 +266,80 @@ class AgentService:
         
         return workflow.compile()
 
+    @staticmethod
+    def _parse_router(message) -> Router:
+        """Parses the supervisor's JSON-mode output into a Router."""
+        try:
+            return Router.model_validate_json(message.content)
+        except Exception as e:
+            # An unparseable decision should end the run gracefully, not crash it
+            logger.warning("Could not parse supervisor output, routing to report_generator: %s", e)
+            return Router(next=["report_generator"], tasks=[])
+
+    def _dispatch_workers(self, state: State):
+        """Fans the supervisor's tasks out as parallel Send branches."""
+        if "report_generator" in state["next"]:
+            return "report_generator"
+        # The LLM's agent strings are untrusted: a name outside the graph's
+        # worker nodes would make Send raise at runtime and kill the request
+        tasks = [t for t in (state.get("tasks") or []) if t.get("agent") in WORKER_NODES]
+        if not tasks:
+            # The supervisor named workers but supplied no usable tasks; give
+            # each named worker the original query rather than generating a
+            # report with nothing gathered
+            tasks = [{"agent": worker, "query": state["query"]}
+                     for worker in state["next"] if worker in WORKER_NODES]
+        if not tasks:
+            logger.warning("Supervisor produced no dispatchable tasks, routing to report_generator.")
+            return "report_generator"
+        # Each independent sub-task gets its own worker branch; the
+        # add_messages reducer merges their outputs back into the state.
+        return [
+            Send(task["agent"], {
+                "messages": [HumanMessage(content=task["query"])],
+                "query": task["query"],
+                "access_token": state.get("access_token"),
+                "session_id": state.get("session_id"),
+            })
+            for task in tasks
+        ]
+
     # --- These are the functions that the graph nodes will execute ---
     async def supervisor_node(self, state: State):
         """Invokes the supervisor chain and parses its structured output."""
-        logger.info("Supervisor deciding next step...")      
+        logger.info("Supervisor deciding next step...")
+
+        # The supervisor only needs the query plus a running summary of what
+        # the workers gathered, not the whole (quadratically growing) history
+        scratchpad = state.get("scratchpad") or []
+        scratchpad_text = "\n".join(scratchpad) if scratchpad else "(nothing gathered yet)"
+
+        # The routing decision only depends on the query and how far the
+        # workers have progressed, so it can be served from cache.
+        cache_key = CacheManager.make_key({"q": state["query"], "progress": scratchpad})
+        cache_text = state["query"] + " | " + scratchpad_text
+        cached = await self.router_cache.get(cache_key, text=cache_text)
+        if cached is not None:
+            logger.info("Supervisor decision served from cache: %s", cached["next"])
+            return cached
+
         # The supervisor chain now returns a Pydantic object (Router)
-        response_object = await self.supervisor_chain.ainvoke(state)        
-        # We access the decision via the object's attribute
-        decision = response_object.next   
-        logger.info(f"Supervisor decision: {decision}")
+        response_object = await self.supervisor_chain.ainvoke(
+            {"query": state["query"], "scratchpad": scratchpad_text}
+        )
+        # We access the decision via the object's attributes
+        decision = response_object.next
+        logger.info("Supervisor decision: %s", decision)
         # This guarantees the 'next' key will be one of the valid routes.
-        return {"next": decision}
+        result = {"next": decision, "tasks": [task.model_dump() for task in response_object.tasks]}
+        # Write-back happens in the background so it stays off the critical
+        # path. Task-bearing decisions embed company-specific sub-queries, so
+        # a near-miss semantic hit would replay tasks for the wrong companies
+        # — only task-free decisions (e.g. "route to report_generator") are
+        # eligible for the semantic tier; exact-key hits remain safe for all.
+        semantic_text = None if result["tasks"] else cache_text
+        self.router_cache.put_async(cache_key, result, text=semantic_text)
+        return result
 
     # Human in loop
     async def human_login_node(self, state: State):
@@ -174,92 +352,119 @@ class AgentService:
             return {"messages": [AIMessage(content="Access token already available.")], "next": "supervisor"} # Route to supervisor
 
         print("\n--- Human Login Required ---")
-        username = input("Please enter your username: ")
-        password = input("Please enter your password: ")
+        # input() is a blocking syscall; run it in a worker thread so the
+        # event loop (and any in-flight MCP keepalives) keeps running
+        username = await asyncio.to_thread(input, "Please enter your username: ")
+        password = await asyncio.to_thread(input, "Please enter your password: ")
         print("--- Input Received ---\n")
 
         # Find the login tool
-        login_tool_list = [tool for tool in self.all_tools if tool.name == "login"]
+        login_tool = self.tool_map.get("login")
 
-        if not login_tool_list:
+        if login_tool is None:
             logger.error("Login tool not found from MCP.")
             return {"messages": [AIMessage(content="Error: Login tool not available.")], "next": END}
 
-        # Extract the single login tool from the list
-        login_tool = login_tool_list[0]
-
         try:
             # Invoke the login tool
             login_response = await login_tool.ainvoke({"username": username, "password": password})
-            access_token = json.loads(login_response).get("access_token")
+            access_token = orjson.loads(login_response).get("access_token")
 
             if access_token:
                 logger.info("Successfully obtained access token.")
-                self._access_token = access_token
+                # Credentials go into graph state: ContextVars set here would
+                # die with this node's task and never reach the workers
+                session_id = await self._open_session(access_token)
                 return {
                     "messages": [AIMessage(content="Successfully logged in and obtained access token.")],
-                    "access_token": access_token
+                    "access_token": access_token,
+                    "session_id": session_id
                 }
             else:
                 logger.warning("Login failed: No access token received.")
                 return {"messages": [AIMessage(content="Login failed. Please try again.")], "next": "human_login"} # Loop back to login
         except Exception as e:
-            logger.error(f"Error during login: {e}")
+            logger.error("Error during login: %s", e)
             return {"messages": [AIMessage(content=f"Error during login: {e}. Please try again.")], "next": "human_login"} # Loop back to login
         
+    async def _open_session(self, access_token: str) -> Optional[str]:
+        """Exchanges the JWT for a server-side session id to cheapen later tool calls."""
+        session_tool = self.tool_map.get("open_session")
+        if session_tool is None:
+            return None
+        try:
+            session_response = await session_tool.ainvoke(
+                {"headers": {"Authorization": f"Bearer {access_token}"}}
+            )
+            session_id = orjson.loads(session_response).get("session_id")
+            logger.info("Opened MCP session for authenticated tool calls.")
+            return session_id
+        except Exception as e:
+            # Bearer-header auth still works, so a failed session open is not fatal
+            logger.warning("Could not open MCP session, falling back to bearer auth: %s", e)
+            return None
+
     async def report_generator_node(self, state: State):
-        """Invokes the report generator chain and returns the final report."""
+        """Streams the report as it is generated and returns the assembled message."""
         logger.info("Generating final report...")
-        report = await self.report_generator_chain.ainvoke(state)
+        # Stream tokens out as they arrive so time-to-first-byte is the
+        # model's first token, not the whole generation
+        buffer = []
+        async for chunk in self.report_generator_chain.astream(state):
+            if chunk.content:
+                self._on_report_token(chunk.content)
+                buffer.append(chunk.content)
+        self._on_report_token("\n")
         # We add the final report to the 'messages' list in the state
-        return {"messages": [report]}
+        return {"messages": [AIMessage(content="".join(buffer))]}
+
+    @staticmethod
+    def _seed_auth_context(state: State):
+        """Copies the credentials from graph state into this branch's ContextVars."""
+        _ACCESS_TOKEN.set(state.get("access_token"))
+        _SESSION_ID.set(state.get("session_id"))
 
     async def web_search_node(self, state: State):
-        """Web search agent with system prompt."""
+        """Web search agent; its system prompt is fixed at agent construction."""
         logger.info("Web search agent processing request...")
-        
-        # Add system message for web search agent
-        messages_with_system = [
-            SystemMessage(content="""You are a web research specialist. Use the wiki_crawler tool to search for company information including revenue, headcount, headquarters, market cap, and other relevant business data. Always use your tools when asked to find information.""")
-        ] + state["messages"]
-        
-        # Create temporary state with system message
-        temp_state = {**state, "messages": messages_with_system}
-        
+        # Seed the tool-call auth vars from state: this node's task context
+        # is what the nested tool coroutines inherit
+        self._seed_auth_context(state)
+
         # Invoke the web search agent
-        result = await self.web_search_agent.ainvoke(temp_state)
-        
-        # Return only the new messages (excluding the system message we added)
-        new_messages = result["messages"][len(messages_with_system):]
-        return {"messages": new_messages}
+        result = await self.web_search_agent.ainvoke({"messages": state["messages"]})
+
+        # Return only the new messages
+        new_messages = result["messages"][len(state["messages"]):]
+        return {"messages": new_messages, "scratchpad": self._summarize("web_search", new_messages)}
 
     async def math_node(self, state: State):
-        """Math agent with system prompt."""
+        """Math agent; its system prompt is fixed at agent construction."""
         logger.info("Math agent processing request...")
-        
-        # Add system message for math agent
-        messages_with_system = [
-            SystemMessage(content="""You are a mathematical calculation specialist. You have access to mathematical tools: add, subtract, multiply, divide, and average. 
-
-IMPORTANT: You MUST use your available tools for ANY mathematical calculations, even simple ones. Never perform calculations manually in your response. Always use the appropriate tool:
-- Use 'add' tool for addition
-- Use 'subtract' tool for subtraction  
-- Use 'multiply' tool for multiplication
-- Use 'divide' tool for division
-- Use 'average' tool for calculating averages
-
-When you receive a request involving numbers or calculations, immediately identify which mathematical operation is needed and use the corresponding tool.""")
-        ] + state["messages"]
-        
-        # Create temporary state with system message
-        temp_state = {**state, "messages": messages_with_system}
-        
+        self._seed_auth_context(state)
+
+        # Trivial arithmetic doesn't need a ReAct loop (two LLM passes plus
+        # an MCP round trip) — evaluate it locally and return straight away
+        last_text = str(state["messages"][-1].content) if state["messages"] else ""
+        value = _try_eval_arithmetic(last_text)
+        if value is not None:
+            logger.info("Math query short-circuited without the LLM.")
+            new_messages = [AIMessage(content=str(value))]
+            return {"messages": new_messages, "scratchpad": self._summarize("math", new_messages)}
+
         # Invoke the math agent
-        result = await self.math_agent.ainvoke(temp_state)
-        
-        # Return only the new messages (excluding the system message we added)
-        new_messages = result["messages"][len(messages_with_system):]
-        return {"messages": new_messages}
+        result = await self.math_agent.ainvoke({"messages": state["messages"]})
+
+        # Return only the new messages
+        new_messages = result["messages"][len(state["messages"]):]
+        return {"messages": new_messages, "scratchpad": self._summarize("math", new_messages)}
+
+    @staticmethod
+    def _summarize(worker: str, new_messages: list) -> list[str]:
+        """Builds the one-line scratchpad entry for a worker's result."""
+        if not new_messages:
+            return []
+        return [f"{worker}: {str(new_messages[-1].content)[:200]}"]
 
     async def agent_invoke(self, query: str):
         print(f"Start process for : {query}")
@@ -267,12 +472,15 @@ When you receive a request involving numbers or calculations, immediately identi
         # Initial state will include the query and an empty access_token
         initial_state = {
             "messages": [HumanMessage(content=query)],
+            "scratchpad": [],
             "query": query,
             "company_name": "", # Still here if needed later
-            "access_token": None
+            "access_token": None,
+            "session_id": None,
+            "tasks": []
         }
         
         final_state = await self.graph.ainvoke(initial_state, {"recursion_limit": 15})
+        # The report was already streamed token-by-token by report_generator_node
         final_report = final_state['messages'][-1].content
-        print(final_report)
         return final_report
\ No newline at end of file
@@ -0,0 +1,86 @@
+import asyncio
+import hashlib
+import logging
+
+import orjson
+from typing import Any, Optional
+
+from langchain_ollama import OllamaEmbeddings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheManager:
+    """
+    Two-tier in-process cache for LLM decisions.
+
+    Tier 1 is an exact match on a hashed key; tier 2 is a semantic match
+    that compares embeddings of the lookup text against previously cached
+    entries. Writes can be scheduled off the critical path with put_async.
+    """
+
+    def __init__(self, maxsize: int = 1024, similarity_threshold: float = 0.9,
+                 embedding_model: str = "llama3.1:8b"):
+        self._maxsize = maxsize
+        self._similarity_threshold = similarity_threshold
+        self._exact: dict[str, Any] = {}
+        self._semantic: list[tuple[list[float], Any]] = []
+        self._embeddings = OllamaEmbeddings(model=embedding_model)
+        # Strong references to in-flight put_async tasks: the event loop
+        # only holds tasks weakly, so without these a pending write could
+        # be garbage-collected mid-flight and never complete
+        self._pending_writes: set = set()
+
+    @staticmethod
+    def make_key(payload: dict) -> str:
+        """Builds a stable exact-match key from a JSON-serializable payload."""
+        return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    async def get(self, key: str, text: Optional[str] = None):
+        """Returns the cached value for key, falling back to semantic lookup on text."""
+        if key in self._exact:
+            return self._exact[key]
+
+        if text and self._semantic:
+            query_vector = await self._embed(text)
+            if query_vector:
+                for vector, value in self._semantic:
+                    if self._cosine_similarity(query_vector, vector) >= self._similarity_threshold:
+                        return value
+        return None
+
+    async def put(self, key: str, value: Any, text: Optional[str] = None):
+        """Stores value under the exact key and, if text is given, in the semantic tier."""
+        if len(self._exact) >= self._maxsize:
+            # Drop the oldest entry (insertion order) to stay bounded
+            self._exact.pop(next(iter(self._exact)))
+        self._exact[key] = value
+
+        if text:
+            vector = await self._embed(text)
+            if vector:
+                if len(self._semantic) >= self._maxsize:
+                    self._semantic.pop(0)
+                self._semantic.append((vector, value))
+
+    def put_async(self, key: str, value: Any, text: Optional[str] = None):
+        """Schedules the cache write as a background task, off the critical path."""
+        task = asyncio.create_task(self.put(key, value, text))
+        self._pending_writes.add(task)
+        task.add_done_callback(self._pending_writes.discard)
+
+    async def _embed(self, text: str) -> Optional[list]:
+        try:
+            return await self._embeddings.aembed_query(text)
+        except Exception as e:
+            logger.warning("Embedding for semantic cache failed: %s", e)
+            return None
+
+    @staticmethod
+    def _cosine_similarity(a: list, b: list) -> float:
+        dot = sum(x * y for x, y in zip(a, b))
+        norm_a = sum(x * x for x in a) ** 0.5
+        norm_b = sum(x * x for x in b) ** 0.5
+        if norm_a == 0 or norm_b == 0:
+            return 0.0
+        return dot / (norm_a * norm_b)
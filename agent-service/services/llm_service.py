@@ -1,8 +1,23 @@
 
 import os
+import logging
+from langchain_core.messages import HumanMessage
 from langchain_ollama.chat_models import ChatOllama
 from langchain_openai import ChatOpenAI
 from langchain_openai import AzureChatOpenAI
 from langchain.chat_models import init_chat_model
 
-llm = ChatOllama(model="llama3.1:8b", temperature=0.1, max_tokens=2048)
\ No newline at end of file
+logger = logging.getLogger(__name__)
+
+# keep_alive keeps the model resident in Ollama between requests instead of
+# paying the multi-second load cost again after idling
+llm = ChatOllama(model="llama3.1:8b", temperature=0.1, max_tokens=2048, keep_alive="1h")
+
+
+async def warmup():
+    """Preloads the model with a throwaway call so the first real request skips the cold start."""
+    try:
+        await llm.ainvoke([HumanMessage(content="ok")])
+        logger.info("Ollama model warmed up.")
+    except Exception as e:
+        logger.warning("Ollama warmup failed (continuing without preload): %s", e)
@@ -1,16 +1,47 @@
 import os
+import asyncio
+from typing import Optional
+
+import httpx
 from langchain_mcp_adapters.client import MultiServerMCPClient
 
+
+def _httpx_client_factory(headers=None, timeout=None, auth=None) -> httpx.AsyncClient:
+    """Builds the transport HTTP client: HTTP/2 with a bounded keepalive pool."""
+    return httpx.AsyncClient(
+        http2=True,
+        headers=headers,
+        timeout=timeout if timeout is not None else httpx.Timeout(30),
+        auth=auth,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+    )
+
+
+# One client for the whole process: tool calls (including the Send fan-out)
+# multiplex over a kept-alive HTTP/2 connection instead of paying a fresh
+# TCP + TLS handshake per request.
+_mcp_client = MultiServerMCPClient({
+    "tool-repository": {
+        "transport": "streamable_http",
+        "url": os.getenv('MCP_URL'),
+        "httpx_client_factory": _httpx_client_factory,
+    }
+})
+
+
 class MCPService:
 
+    # Shared across instances: the tool list never changes while the MCP
+    # server is up, so fetch it once and reuse it.
+    _tools_cache: Optional[list] = None
+    _lock = asyncio.Lock()
+
     async def get_all_tools(self):
-        mcp_client = MultiServerMCPClient({
-        "tool-repository": {
-            "transport": "streamable_http",
-            "url": os.getenv('MCP_URL'),
-        }
-        })
+        if MCPService._tools_cache is not None:
+            return MCPService._tools_cache
 
-        all_tools = await mcp_client.get_tools()
-        return all_tools
+        async with MCPService._lock:
+            if MCPService._tools_cache is None:
+                MCPService._tools_cache = await _mcp_client.get_tools()
 
+        return MCPService._tools_cache
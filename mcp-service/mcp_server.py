@@ -5,13 +5,153 @@ from services.auth import AuthService, ACCESS_TOKEN_EXPIRE_MINUTES, require_auth
 from fastapi import HTTPException, status
 from datetime import timedelta
 from typing import Any
+import ast
+import asyncio
+import functools
+import logging
+import operator
+import orjson
+import time
+import uuid
 
+logger = logging.getLogger(__name__)
 
 mcp = FastMCP("tool-repository", host="127.0.0.1", port=8001, debug=True)
 wiki_service = WikipediaService()
 calculator_service = CalculatorService()
 auth_service = AuthService()
 
+# Wikipedia data changes slowly, so memoize crawler results per company
+# to skip the HTTP fetch + HTML parse on repeat queries.
+_WIKI_CACHE_TTL = 3600
+_WIKI_CACHE_MAXSIZE = 512
+_wiki_cache: dict[str, tuple[float, Any]] = {}
+_wiki_cache_lock = asyncio.Lock()
+
+
+# A JWT is immutable until it expires, so re-verifying it on every tool
+# call is wasted HMAC work. Cache the verified user per token and expire
+# entries at the token's own exp claim.
+_TOKEN_CACHE_MAXSIZE = 4096
+_token_cache: dict[str, tuple[float, dict]] = {}
+
+
+async def _get_cached_user(token: str) -> dict:
+    """Resolves a bearer token to its user, caching verified tokens until expiry."""
+    cached = _token_cache.get(token)
+    if cached and time.time() < cached[0]:
+        return cached[1]
+    _token_cache.pop(token, None)
+
+    # Full verification path: decode once, then look the user up
+    payload = auth_service.decode_access_token(token)
+    user = auth_service.get_user(payload.get("sub"))
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    if len(_token_cache) >= _TOKEN_CACHE_MAXSIZE:
+        _token_cache.pop(next(iter(_token_cache)))
+    _token_cache[token] = (payload.get("exp", time.time() + 300), user)
+    return user
+
+
+# Sessions opened after login: session_id -> (expiry, user). A session
+# lookup is a plain dict probe, so authenticated tool calls skip JWT work
+# entirely. Each session inherits the exp of the JWT it was minted from,
+# so it cannot outlive the token, and the dict is bounded like _token_cache.
+_SESSIONS_MAXSIZE = 4096
+_sessions: dict[str, tuple[float, dict]] = {}
+
+
+def _token_from_headers(headers: dict) -> str:
+    """Extracts the bearer token from an Authorization header dict."""
+    auth_header = headers.get("Authorization") if headers else None
+    if not auth_header or not auth_header.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Token required")
+    return auth_header.split(" ")[1]
+
+
+def require_auth(fn):
+    """Authenticates the caller from 'session_id' or 'headers' before running the tool."""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        # Fast path: a session opened after login is a pure dict lookup
+        session_id = kwargs.get("session_id") or ""
+        session = _sessions.get(session_id)
+        if session and time.time() < session[0]:
+            user = session[1]
+        else:
+            if session:
+                # Expired: evict it and fall back to token auth
+                _sessions.pop(session_id, None)
+            user = await _get_cached_user(_token_from_headers(kwargs.get("headers")))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Tool %s called by %s", fn.__name__, user["username"])
+        return await fn(*args, **kwargs)
+    return wrapper
+
+
+async def _wiki_fetch(company_name: str):
+    """Fetches company info from Wikipedia with a TTL-bounded cache."""
+    key = company_name.strip().lower()
+    async with _wiki_cache_lock:
+        cached = _wiki_cache.get(key)
+        if cached and time.monotonic() - cached[0] < _WIKI_CACHE_TTL:
+            return cached[1]
+
+    # The async path fetches over the shared HTTP/2 client and only
+    # offloads the CPU-bound HTML parse to a worker thread
+    result = await wiki_service.aget_company_info(company_name.strip())
+
+    # Never cache error responses
+    if "error" not in result:
+        async with _wiki_cache_lock:
+            if len(_wiki_cache) >= _WIKI_CACHE_MAXSIZE:
+                _wiki_cache.pop(next(iter(_wiki_cache)))
+            _wiki_cache[key] = (time.monotonic(), result)
+    return result
+
+# Operators allowed inside evaluate() expressions
+_EVAL_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+# Largest exponent magnitude evaluate() will compute; anything bigger
+# (e.g. '9**9**9') would build an astronomically large int and block the
+# single event loop for the whole process
+_MAX_POW_EXPONENT = 1000
+
+
+def _safe_eval(node):
+    """Evaluates a restricted arithmetic AST: numbers, +-*/%**, and mean/average calls."""
+    if isinstance(node, ast.Expression):
+        return _safe_eval(node.body)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _EVAL_OPS:
+        left = _safe_eval(node.left)
+        right = _safe_eval(node.right)
+        if isinstance(node.op, ast.Pow) and abs(right) > _MAX_POW_EXPONENT:
+            raise ValueError(f"Exponent magnitude exceeds {_MAX_POW_EXPONENT}")
+        return _EVAL_OPS[type(node.op)](left, right)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _EVAL_OPS:
+        return _EVAL_OPS[type(node.op)](_safe_eval(node.operand))
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+            and node.func.id in ("mean", "average") and not node.keywords):
+        return calculator_service.Average([_safe_eval(arg) for arg in node.args])
+    raise ValueError(f"Unsupported element in expression: {type(node).__name__}")
+
 @mcp.tool(description= "Login to obtain a JWT token for authenticated access to other tools.")
 async def login(username: str, password: str):
     """
@@ -39,7 +179,9 @@ async def login(username: str, password: str):
     access_token = auth_service.create_access_token(
         data={"sub": user["username"]}, expires_delta=access_token_expires
     )
-    return {"access_token": access_token, "token_type": "bearer"}
+    # Pre-serialize with orjson so the framework ships the string as-is
+    # instead of re-encoding the dict with the stdlib json
+    return orjson.dumps({"access_token": access_token, "token_type": "bearer"}).decode()
 
 @mcp.tool(description="Logout to invalidate the current JWT token.")
 async def logout(headers: dict = None):
@@ -49,36 +191,85 @@ async def logout(headers: dict = None):
     Args:
     user: The current authenticated user.
     """
-    auth_header = headers.get("Authorization") if headers else None
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Token required")
-    token = auth_header.split(" ")[1]
-    current_user = await auth_service.get_current_user(token)
-    print(current_user)
+    token = _token_from_headers(headers)
+    current_user = await _get_cached_user(token)
+    # The token is no longer valid, so drop it from the verified-token cache
+    # along with any sessions the user opened
+    _token_cache.pop(token, None)
+    for session_id in [s for s, (_, u) in _sessions.items() if u["username"] == current_user["username"]]:
+        _sessions.pop(session_id, None)
 
     return {"msg": f"User {current_user['username']} successfully logged out"}
 
+@mcp.tool(description="Open a server-side session after login; pass the returned session_id to other tools instead of the Authorization header.")
+async def open_session(headers: dict = None):
+    """
+    Exchanges a verified JWT for a lightweight session id.
+
+    Args:
+    headers: Headers containing the Authorization bearer token.
+    """
+    token = _token_from_headers(headers)
+    user = await _get_cached_user(token)
+    # The session expires when the JWT it was minted from does (the decode
+    # below is served from the token cache)
+    exp = auth_service.decode_access_token(token).get("exp", time.time() + 300)
+    session_id = str(uuid.uuid4())
+    if len(_sessions) >= _SESSIONS_MAXSIZE:
+        _sessions.pop(next(iter(_sessions)))
+    _sessions[session_id] = (exp, user)
+    return {"session_id": session_id}
+
 @mcp.tool(description="Crawl Wikipedia for information about a company.")
-async def wiki_crawler(company_name: str, headers: dict = None):
+@require_auth
+async def wiki_crawler(company_name: str, headers: dict = None, session_id: str = None):
     """
     Crawls Wikipedia for information about a company.
 
     Args:
     company_name: The name of the company to search for.
     """
-    print("Company Name:", company_name)
-    print("Headers:", headers)
-    auth_header = headers.get("Authorization") if headers else None
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Token required")
-    token = auth_header.split(" ")[1]
-    print(token)
-    current_user = await auth_service.get_current_user(token)
-    print(current_user)
-    return wiki_service.get_company_info_wikipedia(company_name)
+    return orjson.dumps(await _wiki_fetch(company_name)).decode()
+
+@mcp.tool(description="Crawl Wikipedia for several companies in one call; the lookups run concurrently. Prefer this over repeated wiki_crawler calls.")
+@require_auth
+async def wiki_crawler_batch(company_names: list[str], headers: dict = None, session_id: str = None) -> str:
+    """
+    Crawls Wikipedia for several companies concurrently.
+
+    Args:
+    company_names: The names of the companies to search for.
+    """
+    results = await asyncio.gather(*(_wiki_fetch(name) for name in company_names))
+    return orjson.dumps(dict(zip(company_names, results))).decode()
 
-@mcp.tool(description="Add two numbers.")
-async def add(a: float, b: float, headers: dict = None) -> float:
+@mcp.tool(description="Evaluate a complete arithmetic expression in a single call, e.g. '(221000 + 738000) / 2' or 'average(1, 2, 3)'. Prefer this over chaining add/subtract/multiply/divide calls.")
+@require_auth
+async def evaluate(expression: str, headers: dict = None, session_id: str = None) -> float:
+    """
+    Evaluates an arithmetic expression server-side in one round trip.
+
+    Args:
+    expression: The arithmetic expression, e.g. '(1 + 2) * 3'.
+    """
+    try:
+        tree = ast.parse(expression, mode="eval")
+        return _safe_eval(tree)
+    except ZeroDivisionError:
+        # Same error the sibling divide tool raises for this case
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid expression: Cannot divide by zero."
+        )
+    except (SyntaxError, ValueError, OverflowError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid expression: {e}"
+        )
+
+@mcp.tool(description="Add two numbers. Deprecated: prefer 'evaluate' for multi-step arithmetic.")
+@require_auth
+async def add(a: float, b: float, headers: dict = None, session_id: str = None) -> float:
     """
     Adds two numbers.
     
@@ -86,17 +277,11 @@ async def add(a: float, b: float, headers: dict = None) -> float:
     a: The first number.
     b: The second number.
     """
-    print(headers)
-    auth_header = headers.get("Authorization") if headers else None
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Token required")
-    token = auth_header.split(" ")[1]
-    current_user = await auth_service.get_current_user(token)
-    print(current_user)
     return calculator_service.add(a, b)
 
-@mcp.tool(description="Subtract the second number from the first number.")
-async def subtract(a: float, b: float, headers: dict = None) -> float:
+@mcp.tool(description="Subtract the second number from the first number. Deprecated: prefer 'evaluate' for multi-step arithmetic.")
+@require_auth
+async def subtract(a: float, b: float, headers: dict = None, session_id: str = None) -> float:
     """
     Subtracts the second number from the first number.
 
@@ -105,16 +290,11 @@ async def subtract(a: float, b: float, headers: dict = None) -> float:
     b: The second number.
     """
 
-    auth_header = headers.get("Authorization") if headers else None
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Token required")
-    token = auth_header.split(" ")[1]
-    current_user = await auth_service.get_current_user(token)
-    print(current_user)
     return calculator_service.subtract(a, b)
 
-@mcp.tool(description="Multiply two numbers.")
-async def multiply(a: float, b: float, headers: dict = None) -> float:
+@mcp.tool(description="Multiply two numbers. Deprecated: prefer 'evaluate' for multi-step arithmetic.")
+@require_auth
+async def multiply(a: float, b: float, headers: dict = None, session_id: str = None) -> float:
     """
     Multiplies two numbers.
     
@@ -122,16 +302,11 @@ async def multiply(a: float, b: float, headers: dict = None) -> float:
     a: The first number.
     b: The second number.
     """
-    auth_header = headers.get("Authorization") if headers else None
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Token required")
-    token = auth_header.split(" ")[1]
-    current_user = await auth_service.get_current_user(token)
-    print(current_user)
     return calculator_service.multiply(a, b)
 
-@mcp.tool(description="Divide the first number by the second number.")
-async def divide(a: float, b: float, headers: dict = None) -> float:
+@mcp.tool(description="Divide the first number by the second number. Deprecated: prefer 'evaluate' for multi-step arithmetic.")
+@require_auth
+async def divide(a: float, b: float, headers: dict = None, session_id: str = None) -> float:
     """
     Divides the first number by the second number.
 
@@ -139,28 +314,17 @@ async def divide(a: float, b: float, headers: dict = None) -> float:
     a: The first number.
     b: The second number.
     """
-    auth_header = headers.get("Authorization") if headers else None
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Token required")
-    token = auth_header.split(" ")[1]
-    current_user = await auth_service.get_current_user(token)
-    print(current_user)
     return calculator_service.divide(a, b)  
 
 @mcp.tool()
-async def average(numbers: list[float], headers: dict = None) -> float:
+@require_auth
+async def average(numbers: list[float], headers: dict = None, session_id: str = None) -> float:
     """
     Calculates the average of a list of numbers.
 
     Args:
     numbers: A list of numbers.
     """
-    auth_header = headers.get("Authorization") if headers else None
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Token required")
-    token = auth_header.split(" ")[1]
-    current_user = await auth_service.get_current_user(token)
-    print(current_user)
     return calculator_service.Average(numbers)
 
 if __name__ == "__main__":
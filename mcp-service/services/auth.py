@@ -1,8 +1,10 @@
 # For JWT authentication
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from datetime import datetime, timedelta
+import jwt
+from jwt import InvalidTokenError as JWTError
+from datetime import timedelta
+import time
 from passlib.context import CryptContext
 from typing import Any # Added for type hinting
 
@@ -10,10 +12,17 @@ from typing import Any # Added for type hinting
 SECRET_KEY = "123456"  # **IMPORTANT**: Change this to a strong, random key in production!
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+_DEFAULT_EXP_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# A token's payload cannot change once signed, so cache decoded payloads
+# per token and trust them until the token's own exp claim passes.
+# Failed decodes are never cached.
+_DECODE_CACHE_MAXSIZE = 10000
+_decode_cache: dict[str, tuple[float, dict]] = {}
+
 # OAuth2PasswordBearer for extracting token from header
 # This tells FastAPI where to find the token.
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/tool-repository/login_for_access_token") 
@@ -23,7 +32,9 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/tool-repository/login_for_access
 fake_users_db = {
     "testuser": {
         "username": "testuser",
-        "hashed_password": pwd_context.hash("testpassword"),
+        # Precomputed bcrypt hash of "testpassword" (cost 12); hashing it at
+        # import cost a few hundred ms on every worker boot and test run
+        "hashed_password": "$2b$12$AclNnTu3LBalX2cXIGAxV.QzR1dj2DwHDG2UObuKrN6K8/270Qk0.",
         "full_name": "Test User",
         "email": "test@example.com",
         "disabled": False,
@@ -37,8 +48,18 @@ def require_auth_tool(func):
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token required"
             )
-        auth_service = AuthService()
-        user = auth_service.get_user(token)
+        # Decode the JWT and resolve its subject; the token itself is not
+        # a username. The shared instance hits the decode cache, and a
+        # valid token for an unknown user is rejected rather than passing
+        # current_user=None through to the tool.
+        payload = _AUTH.decode_access_token(token)
+        user = _AUTH.get_user(payload.get("sub"))
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
         return await func(*args, current_user=user, **kwargs)
     return wrapper
 
@@ -55,15 +76,21 @@ class AuthService:
     # --- JWT Token Functions ---
     def create_access_token(self, data: dict, expires_delta: timedelta | None = None):
         to_encode = data.copy()
+        # exp is an integer epoch anyway once encoded; plain int arithmetic
+        # skips building and converting datetime objects per token
         if expires_delta:
-            expire = datetime.utcnow() + expires_delta
+            expire = int(time.time()) + int(expires_delta.total_seconds())
         else:
-            expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+            expire = int(time.time()) + _DEFAULT_EXP_SECONDS
         to_encode.update({"exp": expire})
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
         return encoded_jwt
 
     def decode_access_token(self, token: str):
+        cached = _decode_cache.get(token)
+        if cached and time.time() < cached[0]:
+            return cached[1]
+        _decode_cache.pop(token, None)
         try:
             payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
             username: str = payload.get("sub")
@@ -73,6 +100,9 @@ class AuthService:
                     detail="Could not validate credentials",
                     headers={"WWW-Authenticate": "Bearer"},
                 )
+            if len(_decode_cache) >= _DECODE_CACHE_MAXSIZE:
+                _decode_cache.pop(next(iter(_decode_cache)))
+            _decode_cache[token] = (payload.get("exp", time.time() + 300), payload)
             return payload
         except JWTError:
             raise HTTPException(
@@ -93,4 +123,9 @@ class AuthService:
                 detail="User not found", # More specific error
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        return user
\ No newline at end of file
+        return user
+
+
+# Shared instance for module-level helpers; AuthService holds no state,
+# so one is enough.
+_AUTH = AuthService()
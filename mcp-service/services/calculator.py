@@ -1,3 +1,5 @@
+from statistics import fmean
+
 
 class CalculatorService:
     def add(self, a, b):
@@ -17,4 +19,5 @@ class CalculatorService:
     def Average(self, numbers):
         if not numbers:
             raise ValueError("The list of numbers is empty.")
-        return sum(numbers) / len(numbers)
\ No newline at end of file
+        # fmean runs in C and does a single pass in float space
+        return fmean(numbers)
\ No newline at end of file
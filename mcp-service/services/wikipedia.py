@@ -1,69 +1,133 @@
+import asyncio
+import httpx
 import requests
-from bs4 import BeautifulSoup
+import time
+from bs4 import BeautifulSoup, SoupStrainer
 import re
+from collections import OrderedDict
 from typing import Dict, Any, Optional
 import urllib.parse
 
+# LRU of successful lookups keyed on the normalized company name; repeat
+# queries skip the HTTP fetch and the whole parse. Entries carry their
+# store time and expire after a day, falling through to the cheap ETag
+# revalidation below rather than serving stale data for the process
+# lifetime.
+_COMPANY_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_COMPANY_CACHE_MAXSIZE = 512
+_COMPANY_CACHE_TTL = 86400
+
+# ETag of the last fetch per company plus the result parsed from that
+# body. When the page hasn't changed Wikipedia answers 304 with no body,
+# so a revalidation costs one header round trip instead of a full
+# download and re-parse.
+_ETAG_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_ETAG_CACHE_MAXSIZE = 512
+
+# One pooled session for the whole service: repeat fetches to
+# en.wikipedia.org reuse the TCP/TLS connection instead of re-handshaking.
+_SESSION = requests.Session()
+_SESSION.mount('https://', requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=3))
+_SESSION.headers.update({
+    'User-Agent': 'Agentic-AI-With-MCP/1.0 (wiki_crawler tool)',
+    'Accept-Encoding': 'gzip',
+})
+
+# Async counterpart of _SESSION for callers already on the event loop;
+# concurrent lookups multiplex over a shared HTTP/2 connection.
+_ACLIENT = httpx.AsyncClient(
+    http2=True,
+    timeout=15,
+    headers={
+        'User-Agent': 'Agentic-AI-With-MCP/1.0 (wiki_crawler tool)',
+        'Accept-Encoding': 'gzip',
+    },
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+)
+
+# All patterns are compiled once at import; calling the bound method on a
+# compiled pattern skips the re-module cache lookup on every invocation.
+# Matches either a citation marker (with any surrounding whitespace) or a
+# whitespace run, so stripping citations and normalizing whitespace happen
+# in one pass; swallowing the space on both sides of the citation keeps
+# 'billion [1] (2023)' collapsing to a single space, as the two-pass
+# version did
+_CLEAN_RE = re.compile(r'\s*\[\d+\]\s*|\s+')
+
+# The extractor only ever looks at tables (infobox) and paragraphs, so
+# skip building tree nodes for everything else on the page
+_STRAINER = SoupStrainer(['table', 'p'])
+_DOLLAR_RE = re.compile(r'\$[\d,.]+ (?:billion|million|trillion)', re.IGNORECASE)
+_NUMBER_RE = re.compile(r'[\d,]+')
+
+# Deletion table for stripping thousands separators; translate() walks
+# the string once in C without the substring search replace() does
+_NO_COMMA = str.maketrans('', '', ',')
+
+# Infobox header keyword -> result field; one dict lookup per row replaces
+# a ladder of any(keyword in header_text) substring scans
+_HEADER_MAP = {
+    'revenue': 'revenue', 'turnover': 'revenue', 'sales': 'revenue',
+    'employees': 'headcount', 'workforce': 'headcount', 'staff': 'headcount',
+    'headquarters': 'headquarters', 'head office': 'headquarters', 'hq': 'headquarters',
+    'founded': 'founded',
+    'industry': 'industry', 'industries': 'industry',
+    'website': 'website',
+    'ceo': 'ceo', 'chief executive': 'ceo',
+    'market cap': 'market_cap',
+}
+
+# Common revenue / employee patterns, fused into one alternation each so a
+# lookup costs a single scan of the text instead of up to five
+_REVENUE_RE = re.compile(
+    r'(?:revenue[:\s]+.*?\$[\d,.]+ (?:billion|million|trillion)'
+    r'|\$[\d,.]+ (?:billion|million|trillion).*?revenue'
+    r'|(?:total|net|annual) revenue.*?\$[\d,.]+)',
+    re.IGNORECASE)
+
+_HEADCOUNT_RE = re.compile(
+    r'(?:employs?\s+(?:over\s+|approximately\s+|about\s+)?[\d,]+ (?:people|employees)'
+    r'|(?:workforce|staff) of (?:over\s+|approximately\s+|about\s+)?[\d,]+'
+    r'|(?:over\s+|approximately\s+|about\s+)?[\d,]+ (?:full-time )?(?:employees|workers|staff))',
+    re.IGNORECASE)
+
 class WikipediaService:
 
     def clean_text(self, text: str) -> str:
         """Clean and normalize text by removing extra whitespace and unwanted characters"""
         if not text:
             return ""
-        # Remove citations like [1], [2], etc.
-        text = re.sub(r'\[\d+\]', '', text)
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-        return text.strip()
+        # Drop citations like [1], [2] and collapse whitespace in one pass
+        return _CLEAN_RE.sub(' ', text).strip()
 
     def extract_revenue_from_text(self, text: str) -> Dict[str, str]:
         """Extract revenue information from text"""
         revenue_info = {}
-        
-        # Common revenue patterns
-        patterns = [
-            r'revenue[:\s]+.*?\$[\d,.]+ (?:billion|million|trillion)',
-            r'\$[\d,.]+ (?:billion|million|trillion).*?revenue',
-            r'total revenue.*?\$[\d,.]+',
-            r'net revenue.*?\$[\d,.]+',
-            r'annual revenue.*?\$[\d,.]+',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                revenue_info['raw_text'] = matches[0]
-                # Extract the dollar amount
-                dollar_match = re.search(r'\$[\d,.]+ (?:billion|million|trillion)', matches[0], re.IGNORECASE)
-                if dollar_match:
-                    revenue_info['amount'] = dollar_match.group()
-                break
-        
+
+        # Only the first hit is used, so search() lets the regex engine
+        # stop early instead of scanning the whole text into a list
+        m = _REVENUE_RE.search(text)
+        if m:
+            revenue_info['raw_text'] = m.group(0)
+            # Extract the dollar amount
+            dollar_match = _DOLLAR_RE.search(m.group(0))
+            if dollar_match:
+                revenue_info['amount'] = dollar_match.group()
+
         return revenue_info
 
     def extract_headcount_from_text(self, text: str) -> Dict[str, str]:
         """Extract employee/headcount information from text"""
         headcount_info = {}
-        
-        # Common employee patterns
-        patterns = [
-            r'employs?\s+(?:over\s+|approximately\s+|about\s+)?[\d,]+ (?:people|employees)',
-            r'(?:over\s+|approximately\s+|about\s+)?[\d,]+ employees',
-            r'workforce of (?:over\s+|approximately\s+|about\s+)?[\d,]+',
-            r'staff of (?:over\s+|approximately\s+|about\s+)?[\d,]+',
-            r'[\d,]+ (?:full-time )?(?:employees|workers|staff)',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                headcount_info['raw_text'] = matches[0]
-                # Extract the number
-                number_match = re.search(r'[\d,]+', matches[0])
-                if number_match:
-                    headcount_info['count'] = number_match.group().replace(',', '')
-                break
-        
+
+        m = _HEADCOUNT_RE.search(text)
+        if m:
+            headcount_info['raw_text'] = m.group(0)
+            # Extract the number
+            number_match = _NUMBER_RE.search(m.group(0))
+            if number_match:
+                headcount_info['count'] = number_match.group().translate(_NO_COMMA)
+
         return headcount_info
 
     def get_company_info_wikipedia(self, company_name: str) -> Dict[str, Any]:
@@ -77,6 +141,15 @@ class WikipediaService:
             Dictionary with extracted company information
         """
         
+        cache_key = company_name.strip().lower()
+        cached = _COMPANY_CACHE.get(cache_key)
+        if cached is not None:
+            if time.monotonic() - cached[0] < _COMPANY_CACHE_TTL:
+                _COMPANY_CACHE.move_to_end(cache_key)
+                return cached[1]
+            # Expired: drop it so the fetch below revalidates via ETag
+            _COMPANY_CACHE.pop(cache_key, None)
+
         # URL encode the company name
         encoded_name = urllib.parse.quote(company_name.replace(" ", "_"))
         
@@ -84,106 +157,181 @@ class WikipediaService:
         api_url = f"https://en.wikipedia.org/api/rest_v1/page/html/{encoded_name}"
         
         try:
-            response = requests.get(api_url, timeout=15) 
+            etag_entry = _ETAG_CACHE.get(cache_key)
+            headers = {'If-None-Match': etag_entry[0]} if etag_entry else None
+            response = _SESSION.get(api_url, timeout=15, headers=headers)
+            if response.status_code == 304 and etag_entry:
+                # Page unchanged since last parse; reuse the stored result
+                # and restart its TTL clock in the LRU
+                _ETAG_CACHE.move_to_end(cache_key)
+                self._store_result(cache_key, etag_entry[1], etag_entry[0])
+                return etag_entry[1]
             response.raise_for_status()
-            
-            # Parse HTML content
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            result = {
-                "company_name": company_name,
-                "wikipedia_url": f"https://en.wikipedia.org/wiki/{encoded_name}",
-                "revenue": {},
-                "headcount": {},
-                "headquarters": {},
-                "founded": "",
-                "industry": "",
-                "website": "",
-                "ceo": "",
-                "market_cap": {},
-                "source": "Wikipedia"
-            }
-            
-            # Extract infobox information
-            infobox = soup.find('table', {'class': re.compile(r'infobox')})
-            
-            if infobox:
-                # Extract information from infobox rows
-                rows = infobox.find_all('tr')
-                
-                for row in rows:
-                    header = row.find('th')
-                    data = row.find('td')
-                    
-                    if header and data:
-                        header_text = self.clean_text(header.get_text()).lower()
-                        data_text = self.clean_text(data.get_text())
-                        
-                        # Revenue patterns
-                        if any(keyword in header_text for keyword in ['revenue', 'turnover', 'sales']):
-                            result['revenue'] = {
-                                'raw_text': data_text,
-                                'field_name': header_text
-                            }
-                            # Try to extract amount
-                            dollar_match = re.search(r'\$[\d,.]+ (?:billion|million|trillion)', data_text, re.IGNORECASE)
-                            if dollar_match:
-                                result['revenue']['amount'] = dollar_match.group()
-                        
-                        # Employee/headcount patterns
-                        elif any(keyword in header_text for keyword in ['employees', 'workforce', 'staff']):
-                            result['headcount'] = {
-                                'raw_text': data_text,
-                                'field_name': header_text
-                            }
-                            # Extract number
-                            number_match = re.search(r'[\d,]+', data_text)
-                            if number_match:
-                                result['headcount']['count'] = number_match.group().replace(',', '')
-                        
-                        # Headquarters patterns
-                        elif any(keyword in header_text for keyword in ['headquarters', 'head office', 'hq']):
-                            result['headquarters'] = {
-                                'raw_text': data_text,
-                                'field_name': header_text
-                            }
-                        
-                        # Other useful information
-                        elif 'founded' in header_text:
-                            result['founded'] = data_text
-                        elif 'industry' in header_text or 'industries' in header_text:
-                            result['industry'] = data_text
-                        elif 'website' in header_text:
-                            result['website'] = data_text
-                        elif any(keyword in header_text for keyword in ['ceo', 'chief executive']):
-                            result['ceo'] = data_text
-                        elif 'market cap' in header_text:
-                            result['market_cap'] = {
-                                'raw_text': data_text,
-                                'field_name': header_text
-                            }
-            
-            # If infobox didn't provide revenue/headcount, search in article text
-            if not result['revenue'] or not result['headcount']:
-                # Get the full article text
-                paragraphs = soup.find_all('p')
-                full_text = ' '.join([p.get_text() for p in paragraphs[:10]])  # First 10 paragraphs
-                
-                if not result['revenue']:
-                    revenue_info = self.extract_revenue_from_text(full_text)
-                    if revenue_info:
-                        result['revenue'] = revenue_info
-                
-                if not result['headcount']:
-                    headcount_info = self.extract_headcount_from_text(full_text)
-                    if headcount_info:
-                        result['headcount'] = headcount_info
-            
+
+            result = self._parse_html(response.content, company_name, encoded_name)
+
+            self._store_result(cache_key, result, response.headers.get('ETag'))
             return result
-            
+
         except requests.exceptions.RequestException as e:
             return {"error": f"Wikipedia request failed: {str(e)}"}
         except Exception as e:
             return {"error": f"Error processing Wikipedia data: {str(e)}"}
 
-    
\ No newline at end of file
+    async def aget_company_info(self, company_name: str) -> Dict[str, Any]:
+        """
+        Async variant of get_company_info_wikipedia for callers already on
+        the event loop. The fetch uses the shared HTTP/2 client and the
+        CPU-bound parse runs in a worker thread so the loop stays free.
+        """
+        cache_key = company_name.strip().lower()
+        cached = _COMPANY_CACHE.get(cache_key)
+        if cached is not None:
+            if time.monotonic() - cached[0] < _COMPANY_CACHE_TTL:
+                _COMPANY_CACHE.move_to_end(cache_key)
+                return cached[1]
+            # Expired: drop it so the fetch below revalidates via ETag
+            _COMPANY_CACHE.pop(cache_key, None)
+
+        encoded_name = urllib.parse.quote(company_name.replace(" ", "_"))
+        api_url = f"https://en.wikipedia.org/api/rest_v1/page/html/{encoded_name}"
+
+        try:
+            etag_entry = _ETAG_CACHE.get(cache_key)
+            headers = {'If-None-Match': etag_entry[0]} if etag_entry else None
+            response = await _ACLIENT.get(api_url, headers=headers)
+            if response.status_code == 304 and etag_entry:
+                _ETAG_CACHE.move_to_end(cache_key)
+                self._store_result(cache_key, etag_entry[1], etag_entry[0])
+                return etag_entry[1]
+            response.raise_for_status()
+
+            result = await asyncio.to_thread(
+                self._parse_html, response.content, company_name, encoded_name)
+
+            self._store_result(cache_key, result, response.headers.get('ETag'))
+            return result
+
+        except httpx.HTTPError as e:
+            return {"error": f"Wikipedia request failed: {str(e)}"}
+        except Exception as e:
+            return {"error": f"Error processing Wikipedia data: {str(e)}"}
+
+    async def get_many(self, company_names: list) -> Dict[str, Dict[str, Any]]:
+        """Looks up several companies concurrently; returns name -> result."""
+        results = await asyncio.gather(
+            *(self.aget_company_info(name) for name in company_names))
+        return dict(zip(company_names, results))
+
+    def _store_result(self, cache_key: str, result: Dict[str, Any], etag: Optional[str]):
+        """Stores a successful parse in the LRU and ETag caches."""
+        _COMPANY_CACHE[cache_key] = (time.monotonic(), result)
+        if len(_COMPANY_CACHE) > _COMPANY_CACHE_MAXSIZE:
+            _COMPANY_CACHE.popitem(last=False)
+        if etag:
+            _ETAG_CACHE[cache_key] = (etag, result)
+            if len(_ETAG_CACHE) > _ETAG_CACHE_MAXSIZE:
+                _ETAG_CACHE.popitem(last=False)
+
+    def _parse_html(self, content: bytes, company_name: str, encoded_name: str) -> Dict[str, Any]:
+        """Parses a Wikipedia page body into the company-info result dict."""
+        # Parse HTML content; lxml is a C parser, several times faster
+        # than the pure-Python html.parser on Wikipedia-sized pages
+        soup = BeautifulSoup(content, 'lxml', parse_only=_STRAINER)
+
+        result = {
+            "company_name": company_name,
+            "wikipedia_url": f"https://en.wikipedia.org/wiki/{encoded_name}",
+            "revenue": {},
+            "headcount": {},
+            "headquarters": {},
+            "founded": "",
+            "industry": "",
+            "website": "",
+            "ceo": "",
+            "market_cap": {},
+            "source": "Wikipedia"
+        }
+        
+        # Extract infobox information. class_ does an exact token match
+        # against each table's class list, cheaper than running a regex
+        # per candidate, and 'infobox' is a literal class on these tables
+        infobox = soup.find('table', class_='infobox')
+        
+        if infobox:
+            # Extract information from infobox rows
+            rows = infobox.find_all('tr')
+            
+            for row in rows:
+                # Direct .th/.td attribute access skips find()'s search
+                # machinery; one descendant walk per cell instead of two
+                header = row.th
+                data = row.td
+
+                if header and data:
+                    # strip=True normalizes whitespace during the text
+                    # walk, so clean_text mostly just strips citations
+                    header_text = self.clean_text(header.get_text(' ', strip=True)).lower()
+                    data_text = self.clean_text(data.get_text(' ', strip=True))
+                    
+                    # Fast path on the first word; fall back to a single
+                    # substring scan over the map for multi-word headers
+                    first_word = header_text.split(' ', 1)[0]
+                    field = _HEADER_MAP.get(first_word) or next(
+                        (v for k, v in _HEADER_MAP.items() if k in header_text), None)
+
+                    if field == 'revenue':
+                        result['revenue'] = {
+                            'raw_text': data_text,
+                            'field_name': header_text
+                        }
+                        # Try to extract amount
+                        dollar_match = _DOLLAR_RE.search(data_text)
+                        if dollar_match:
+                            result['revenue']['amount'] = dollar_match.group()
+                    elif field == 'headcount':
+                        result['headcount'] = {
+                            'raw_text': data_text,
+                            'field_name': header_text
+                        }
+                        # Extract number
+                        number_match = _NUMBER_RE.search(data_text)
+                        if number_match:
+                            result['headcount']['count'] = number_match.group().translate(_NO_COMMA)
+                    elif field == 'headquarters':
+                        result['headquarters'] = {
+                            'raw_text': data_text,
+                            'field_name': header_text
+                        }
+                    elif field == 'founded':
+                        result['founded'] = data_text
+                    elif field == 'industry':
+                        result['industry'] = data_text
+                    elif field == 'website':
+                        result['website'] = data_text
+                    elif field == 'ceo':
+                        result['ceo'] = data_text
+                    elif field == 'market_cap':
+                        result['market_cap'] = {
+                            'raw_text': data_text,
+                            'field_name': header_text
+                        }
+        
+        # If infobox didn't provide revenue/headcount, search in article text
+        if not result['revenue'] or not result['headcount']:
+            # limit=10 makes find_all stop after the first 10 paragraphs
+            # instead of walking the whole tree and slicing afterwards
+            paragraphs = soup.find_all('p', limit=10)
+            full_text = ' '.join([p.get_text() for p in paragraphs])
+
+            if not result['revenue']:
+                revenue_info = self.extract_revenue_from_text(full_text)
+                if revenue_info:
+                    result['revenue'] = revenue_info
+            
+            if not result['headcount']:
+                headcount_info = self.extract_headcount_from_text(full_text)
+                if headcount_info:
+                    result['headcount'] = headcount_info
+        
+        return result